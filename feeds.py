@@ -0,0 +1,237 @@
+"""
+RSS 2.0, Atom and JSON Feed outputs built from a ring of recent articles.
+
+Feeds are published for all sources combined and for every source:
+- data/feeds/<path>/feed.json  - JSON Feed 1.1
+- data/feeds/<path>/rss.xml    - RSS 2.0
+- data/feeds/<path>/atom.xml   - Atom 1.0
+- data/feeds/index.json        - Available feeds with item counts and hashes
+
+where <path> is "all" for the combined feed or "source/<source>" with the
+slugged source name (see slugify), so no source can write into the combined
+feed; the display name is kept in the feed titles. Each feed holds the newest
+max_items articles; the JSON Feed file doubles as the persisted ring, so a
+run only adds its new articles instead of rebuilding feeds from the archive.
+Feeds without new items are not touched, and every feed's timestamp is that
+of its newest item, so unchanged feeds keep identical bytes (and ETags).
+"""
+import hashlib
+import json
+import logging
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, Iterable, List
+
+from snapshot_writer import SnapshotWriter, sha256_hex, slugify, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://raw.githubusercontent.com/gaurovgiri/newsapi/refs/heads/master/data/'
+HOME_PAGE_URL = 'https://github.com/gaurovgiri/newsapi'
+ALL_FEED = 'all'
+SOURCE_FEEDS = 'source'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+
+def item_id(article: dict) -> str:
+    """
+    Return a stable feed item ID for an article.
+
+    The ID is derived from the same (title, source) pair used to detect
+    duplicate articles, so an article keeps its ID across runs.
+    """
+    key = f"{article.get('source', '')}\n{article.get('title', '')}"
+    return 'urn:sha1:' + hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _to_item(article: dict, published: str) -> dict:
+    """Convert an article dictionary into a JSON Feed item."""
+    item = {
+        'id': item_id(article),
+        'title': article.get('title', ''),
+        'summary': article.get('summary', ''),
+        'content_text': article.get('summary', ''),
+        'date_published': published,
+        'language': article.get('language', ''),
+        'tags': [article.get('source', '')]
+    }
+    if article.get('source_url'):
+        item['url'] = article['source_url']
+    if article.get('image_url'):
+        item['image'] = article['image_url']
+    return item
+
+
+def _text(parent: ET.Element, tag: str, text: str, **attrib) -> ET.Element:
+    element = ET.SubElement(parent, tag, attrib)
+    element.text = text
+    return element
+
+
+def _xml_bytes(root: ET.Element) -> bytes:
+    ET.indent(root)
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True) + b'\n'
+
+
+class FeedPublisher:
+    """Publishes RSS, Atom and JSON Feed files for the scraped articles."""
+
+    FEEDS_DIR = 'feeds'
+
+    def __init__(self, writer: SnapshotWriter, base_url: str = DEFAULT_BASE_URL, max_items: int = 100):
+        """
+        Initialize the feed publisher.
+
+        Args:
+            writer: Snapshot writer whose output directory holds the feeds
+            base_url: Public URL of the data directory, used for feed links
+            max_items: Number of most recent articles kept in each feed
+        """
+        self.feeds_dir = writer.output_dir / self.FEEDS_DIR
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_items = max_items
+
+    def _feed_url(self, path: str, file_name: str) -> str:
+        return f"{self.base_url}{self.FEEDS_DIR}/{path}/{file_name}"
+
+    def _load_ring(self, path: str) -> deque:
+        """Load the items of a feed, newest first, from its JSON Feed file."""
+        ring = deque(maxlen=self.max_items)
+        feed_file = self.feeds_dir / path / 'feed.json'
+        if not feed_file.exists():
+            return ring
+        try:
+            with open(feed_file, 'r', encoding='utf-8') as f:
+                ring.extend(json.load(f).get('items', []))
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Could not load feed from %s: %s", feed_file, e)
+        return ring
+
+    def publish(self, articles: Iterable[dict], published: datetime) -> None:
+        """
+        Add new articles to the combined and per-source feeds.
+
+        Args:
+            articles: New article dictionaries (already de-duplicated)
+            published: Time the articles were scraped (timezone aware)
+        """
+        timestamp = published.isoformat(timespec='seconds')
+        # New items and display name (empty for the combined feed) per feed path
+        new_items: Dict[str, List[dict]] = {}
+        sources: Dict[str, str] = {ALL_FEED: ''}
+        for article in articles:
+            item = _to_item(article, timestamp)
+            new_items.setdefault(ALL_FEED, []).append(item)
+            source = article.get('source', '')
+            if source:
+                path = f"{SOURCE_FEEDS}/{slugify(source)}"
+                sources[path] = source
+                new_items.setdefault(path, []).append(item)
+
+        changed = 0
+        for path, items in new_items.items():
+            ring = self._load_ring(path)
+            known = {existing['id'] for existing in ring}
+            added = [item for item in items if item['id'] not in known]
+            if not added:
+                continue
+            # Newest first; the oldest items fall off the end of the ring
+            ring.extendleft(reversed(added))
+            self._write_feed(path, sources[path], list(ring))
+            changed += 1
+
+        self._write_index()
+        logger.info("Updated %d feeds in %s", changed, self.feeds_dir)
+
+    def _write_feed(self, path: str, source: str, items: List[dict]) -> None:
+        title = f"Nepali News API - {source}" if source else 'Nepali News API'
+        updated = items[0]['date_published']
+        feed_dir = self.feeds_dir / path
+
+        json_feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': title,
+            'home_page_url': HOME_PAGE_URL,
+            'feed_url': self._feed_url(path, 'feed.json'),
+            'items': items
+        }
+        write_if_changed(feed_dir / 'feed.json',
+                         json.dumps(json_feed, ensure_ascii=False, indent=2).encode('utf-8'))
+        write_if_changed(feed_dir / 'rss.xml', self._rss(path, source, title, updated, items))
+        write_if_changed(feed_dir / 'atom.xml', self._atom(path, title, updated, items))
+
+    def _rss(self, path: str, source: str, title: str, updated: str, items: List[dict]) -> bytes:
+        rss = ET.Element('rss', {'version': '2.0', 'xmlns:atom': ATOM_NS})
+        channel = ET.SubElement(rss, 'channel')
+        _text(channel, 'title', title)
+        _text(channel, 'link', HOME_PAGE_URL)
+        _text(channel, 'description', f"Latest news from {source or 'all sources'}")
+        ET.SubElement(channel, 'atom:link', {
+            'href': self._feed_url(path, 'rss.xml'), 'rel': 'self', 'type': 'application/rss+xml'
+        })
+        _text(channel, 'lastBuildDate', format_datetime(datetime.fromisoformat(updated)))
+
+        for item in items:
+            entry = ET.SubElement(channel, 'item')
+            _text(entry, 'title', item['title'])
+            if item.get('url'):
+                _text(entry, 'link', item['url'])
+            _text(entry, 'description', item['summary'])
+            _text(entry, 'guid', item['id'], isPermaLink='false')
+            _text(entry, 'category', item['tags'][0])
+            _text(entry, 'pubDate', format_datetime(datetime.fromisoformat(item['date_published'])))
+
+        return _xml_bytes(rss)
+
+    def _atom(self, path: str, title: str, updated: str, items: List[dict]) -> bytes:
+        feed = ET.Element('feed', {'xmlns': ATOM_NS})
+        _text(feed, 'id', self._feed_url(path, 'atom.xml'))
+        _text(feed, 'title', title)
+        _text(feed, 'updated', updated)
+        ET.SubElement(feed, 'link', {'href': self._feed_url(path, 'atom.xml'), 'rel': 'self'})
+        ET.SubElement(feed, 'link', {'href': HOME_PAGE_URL, 'rel': 'alternate'})
+
+        for item in items:
+            entry = ET.SubElement(feed, 'entry')
+            _text(entry, 'id', item['id'])
+            _text(entry, 'title', item['title'])
+            _text(entry, 'updated', item['date_published'])
+            author = ET.SubElement(entry, 'author')
+            _text(author, 'name', item['tags'][0])
+            if item.get('url'):
+                ET.SubElement(entry, 'link', {'href': item['url'], 'rel': 'alternate'})
+            _text(entry, 'summary', item['summary'])
+
+        return _xml_bytes(feed)
+
+    def _write_index(self) -> None:
+        """Write data/feeds/index.json listing every feed with its hashes."""
+        feed_dirs = [self.feeds_dir / ALL_FEED]
+        source_dir = self.feeds_dir / SOURCE_FEEDS
+        if source_dir.is_dir():
+            feed_dirs.extend(sorted(p for p in source_dir.iterdir() if p.is_dir()))
+
+        feeds = {}
+        for feed_dir in feed_dirs:
+            if not feed_dir.is_dir():
+                continue
+            path = feed_dir.relative_to(self.feeds_dir).as_posix()
+            files = {}
+            for file_path in sorted(feed_dir.iterdir()):
+                payload = file_path.read_bytes()
+                files[file_path.name] = {
+                    'url': self._feed_url(path, file_path.name),
+                    'bytes': len(payload),
+                    'sha256': sha256_hex(payload)
+                }
+            ring = self._load_ring(path)
+            feeds[path] = {
+                'items': len(ring),
+                'updated': ring[0]['date_published'] if ring else None,
+                'files': files
+            }
+
+        payload = json.dumps({'feeds': feeds}, ensure_ascii=False, indent=2).encode('utf-8')
+        write_if_changed(self.feeds_dir / 'index.json', payload)
@@ -0,0 +1,244 @@
+"""
+Optional post-scrape stage that probes article image URLs.
+
+Each image URL is resolved against the article URL and probed with a single
+small Range GET (HEAD is only used if the server rejects the range). Only the
+first bytes of the image are downloaded, which is enough to read the pixel
+dimensions of PNG, GIF, JPEG and WebP files. Results are stored in a
+persistent cache (by default data/image-cache.json) keyed by URL, so an image
+is probed again only while its last result was a transient failure, and are
+attached to the articles as Article.image.
+"""
+import json
+import logging
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from news_source import Article, ImageMeta
+
+logger = logging.getLogger(__name__)
+
+# Statuses that are final enough to cache: success, or the image is gone.
+# Anything else (5xx, 429, 403, network errors) is probed again next run.
+PERMANENT_ERROR_STATUSES = {404, 410}
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            i += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[i + 5:i + 9])
+            return width, height
+        (length,) = struct.unpack('>H', data[i + 2:i + 4])
+        i += 2 + length
+    return None
+
+
+def image_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read the pixel dimensions from the first bytes of an image.
+
+    Args:
+        data: Leading bytes of a PNG, GIF, JPEG or WebP file
+
+    Returns:
+        Tuple of (width, height), or None if the format is not recognized or
+        the header is not contained in data
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n') and len(data) >= 24 and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+    if data.startswith(b'\xff\xd8'):
+        return _jpeg_dimensions(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L' and data[20] == 0x2F:
+            (bits,) = struct.unpack('<I', data[21:25])
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            width = int.from_bytes(data[24:27], 'little') + 1
+            height = int.from_bytes(data[27:30], 'little') + 1
+            return width, height
+    return None
+
+
+def _is_cacheable(meta: dict) -> bool:
+    status = meta.get('status')
+    return status is not None and (200 <= status < 300 or status in PERMANENT_ERROR_STATUSES)
+
+
+def resolve_image_url(image_url: str, source_url: str) -> str:
+    """
+    Resolve a possibly relative image URL against the article URL.
+
+    Returns:
+        Absolute http(s) URL, or an empty string if the URL cannot be probed
+    """
+    if not image_url:
+        return ''
+    url = urljoin(source_url, image_url.strip())
+    return url if urlparse(url).scheme in ('http', 'https') else ''
+
+
+class ImageProber:
+    """Probes image URLs concurrently and caches their metadata."""
+
+    def __init__(self, cache_file: Path, max_workers: int = 8, timeout: int = 10,
+                 header_bytes: int = 65536, session: Optional[requests.Session] = None):
+        """
+        Initialize the image prober and load the cache.
+
+        Args:
+            cache_file: JSON file that persists probe results keyed by URL
+            max_workers: Maximum number of concurrent probes
+            timeout: Request timeout in seconds
+            header_bytes: Number of leading bytes fetched to read dimensions
+            session: Requests session to use (a new one is created by default)
+        """
+        self.cache_file = Path(cache_file)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.header_bytes = header_bytes
+
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': 'Mozilla/5.0 (compatible; newsapi-image-probe)'})
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+        self.cache: Dict[str, dict] = {}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning("Could not load image cache from %s: %s", self.cache_file, e)
+
+    @staticmethod
+    def _content_type(response: requests.Response) -> Optional[str]:
+        return response.headers.get('Content-Type', '').split(';')[0].strip() or None
+
+    def probe(self, url: str) -> dict:
+        """
+        Probe a single image URL.
+
+        A single Range GET for the first header_bytes bytes gives the status,
+        content type, total size (from Content-Range) and the header bytes used
+        for the dimensions. The body is not read when the response is clearly
+        not an image. Only if the server rejects the range (416) is a HEAD
+        request sent for the status, type and size.
+
+        Args:
+            url: Absolute image URL
+
+        Returns:
+            Dictionary with the fields of ImageMeta
+        """
+        meta = {'url': url}
+        try:
+            headers = {'Range': f"bytes=0-{self.header_bytes - 1}"}
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                meta['status'] = response.status_code
+                if response.status_code != 416:
+                    if not response.ok:
+                        return meta
+                    meta['content_type'] = self._content_type(response)
+                    content_range = response.headers.get('Content-Range', '')
+                    if response.status_code == 206 and '/' in content_range:
+                        total = content_range.rsplit('/', 1)[1]
+                        if total.isdigit():
+                            meta['bytes'] = int(total)
+                    elif response.headers.get('Content-Length', '').isdigit():
+                        meta['bytes'] = int(response.headers['Content-Length'])
+                    if meta['content_type'] and not meta['content_type'].startswith('image/'):
+                        return meta
+
+                    data = b''
+                    # Servers that ignore Range send the whole file; stop after the header
+                    for chunk in response.iter_content(chunk_size=8192):
+                        data += chunk
+                        if len(data) >= self.header_bytes:
+                            break
+                    dimensions = image_dimensions(data)
+                    if dimensions:
+                        meta['width'], meta['height'] = dimensions
+                    return meta
+
+            # Range not satisfiable (e.g. an empty file): fall back to HEAD
+            head = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            meta['status'] = head.status_code
+            if head.ok:
+                meta['content_type'] = self._content_type(head)
+                if head.headers.get('Content-Length', '').isdigit():
+                    meta['bytes'] = int(head.headers['Content-Length'])
+        except (requests.RequestException, ValueError) as e:
+            # Malformed URLs (e.g. overlong host labels) raise ValueError subclasses
+            logger.warning("Error probing image %s: %s", url, e)
+            meta['error'] = str(e)
+        return meta
+
+    def probe_articles(self, articles: List[Article]) -> None:
+        """
+        Probe the images of all articles and attach the results.
+
+        URLs already in the cache are not probed again. Only successful
+        (2xx) and permanently missing (404/410) results are cached; transient
+        failures such as 5xx, 429, 403 or network errors are probed again on
+        the next run.
+
+        Args:
+            articles: Scraped articles; Article.image is set in place
+        """
+        urls = {resolve_image_url(article.image_url, article.source_url) for article in articles} - {''}
+        pending = sorted(url for url in urls if not _is_cacheable(self.cache.get(url, {})))
+        logger.info("Probing %d new image URLs (%d cached)...", len(pending), len(urls) - len(pending))
+
+        results = dict(self.cache)
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for meta in executor.map(self.probe, pending):
+                    results[meta['url']] = meta
+                    if _is_cacheable(meta):
+                        meta['checked_at'] = datetime.now().isoformat(timespec='seconds')
+                        self.cache[meta['url']] = meta
+                    else:
+                        self.cache.pop(meta['url'], None)
+            self.save()
+
+        for article in articles:
+            url = resolve_image_url(article.image_url, article.source_url)
+            if url in results and 'error' not in results[url]:
+                article.image = ImageMeta(**results[url])
+
+    def save(self) -> None:
+        """Write the probe cache to disk."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.cache.items())), f, ensure_ascii=False, indent=2)
+        logger.info("Saved %d image probe results to %s", len(self.cache), self.cache_file)
@@ -3,14 +3,23 @@ News Scraper - Main script to scrape news from multiple sources
 and save to JSON files.
 
 Usage:
-    python scrape_news.py
+    python scrape_news.py [--probe-images]
 
 The script will:
 1. Scrape news from all configured sources
 2. Save results to data/YYYY-MM-DD.json
 3. Also save a copy to data/today.json
+4. Write minified/compressed variants and data/manifest.json
+5. Write per-source and per-language shards to data/YYYY-MM-DD/
+6. Update archive statistics in data/stats.json
+7. Update trending terms in data/trending.json
+8. Update RSS/Atom/JSON feeds in data/feeds/
+
+With --probe-images, image URLs are probed before saving and their status,
+type, size and dimensions are attached to each article as "image".
 """
 
+import argparse
 import json
 import logging
 import sys
@@ -18,13 +27,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import List
 
+from feeds import FeedPublisher
+from image_probe import ImageProber
 from news_source import Article
-from sources import (
-    News24Source,
-    KathmanduPostSource,
-    EkantipurSource,
-    NagarikNewsSource
-)
+from rollups import StatsRollup
+from shards import write_shards
+from snapshot_writer import SnapshotWriter
+from trending import TrendingEngine
+from sources import ALL_SOURCES
 
 # Configure logging
 logging.basicConfig(
@@ -41,23 +51,25 @@ logger = logging.getLogger(__name__)
 class NewsScraper:
     """Main scraper that orchestrates scraping from all sources."""
     
-    def __init__(self, output_dir: str = 'data'):
+    def __init__(self, output_dir: str = 'data', probe_images: bool = False):
         """
         Initialize the news scraper.
         
         Args:
             output_dir: Directory to save JSON files
+            probe_images: Probe article images and attach their metadata
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.writer = SnapshotWriter(self.output_dir)
         
         # Initialize all news sources
-        self.sources = [
-            News24Source(),
-            KathmanduPostSource(),
-            EkantipurSource(),
-            NagarikNewsSource()
-        ]
+        self.sources = [source_class() for source_class in ALL_SOURCES]
+        
+        self.rollup = StatsRollup(self.writer, [source.source_name for source in self.sources])
+        self.trending = TrendingEngine(self.writer)
+        self.feeds = FeedPublisher(self.writer)
+        self.image_prober = ImageProber(self.output_dir / 'image-cache.json') if probe_images else None
     
     def scrape_all(self) -> List[Article]:
         """
@@ -120,7 +132,7 @@ class NewsScraper:
             List of merged article dictionaries
         """
         # Convert new articles to dicts
-        new_dicts = [article.model_dump() for article in new_articles]
+        new_dicts = [article.model_dump(exclude_none=True) for article in new_articles]
         
         # Create a set of (title, source) tuples for existing articles
         existing_keys = {(article.get('title', ''), article.get('source', '')) 
@@ -151,6 +163,16 @@ class NewsScraper:
         1. data/YYYY-MM-DD.json - Date-stamped file (always appends for same date)
         2. data/today.json - Overwrites if date changed, appends if same date
         
+        Each file is also written as .min.json and precompressed variants,
+        and data/manifest.json is updated with their sizes and hashes.
+        Per-source and per-language shards of the date file are written to
+        data/YYYY-MM-DD/ alongside an index.json, and the daily, weekly and
+        monthly rollups in data/stats.json are updated for the date file.
+        The new articles are also fed to the trending engine, which writes
+        data/trending.json next to today.json, and added to the feeds in
+        data/feeds/. These derived outputs are written after both snapshots;
+        if one of them fails, a warning is logged and the others still run.
+        
         New articles are checked for duplicates (by title + source) before appending.
         
         Args:
@@ -179,8 +201,7 @@ class NewsScraper:
             'articles': merged_date
         }
         
-        with open(date_file, 'w', encoding='utf-8') as f:
-            json.dump(date_output, f, ensure_ascii=False, indent=2)
+        date_variants = self.writer.write(date_file, date_output)
         
         new_count = len(merged_date) - len(existing_date)
         logger.info("Saved %d articles to %s (%d new, %d total)", 
@@ -195,7 +216,7 @@ class NewsScraper:
             # Date changed - overwrite with new data
             logger.info("Date changed from %s to %s - overwriting today.json", 
                        existing_date_str, date_str)
-            articles_dict = [article.model_dump() for article in articles]
+            articles_dict = [article.model_dump(exclude_none=True) for article in articles]
             merged_today = articles_dict
             new_count_today = len(articles)
         else:
@@ -212,11 +233,44 @@ class NewsScraper:
             'articles': merged_today
         }
         
-        with open(today_file, 'w', encoding='utf-8') as f:
-            json.dump(today_output, f, ensure_ascii=False, indent=2)
+        today_variants = self.writer.write(today_file, today_output)
         
         logger.info("Saved %d articles to %s (%d new, %d total)", 
                    new_count_today, today_file, new_count_today, len(merged_today))
+        
+        self.writer.update_manifest({
+            date_file.name: date_variants,
+            today_file.name: today_variants
+        })
+        
+        # Derived outputs - a failure in one of them must not affect the snapshots
+        new_articles = merged_date[len(existing_date):]
+        derived_variants = {}
+        
+        try:
+            write_shards(self.writer, date_str, merged_date)
+        except Exception as e:
+            logger.warning("Failed to write shards: %s", e)
+        
+        try:
+            self.rollup.update_day(date_str, merged_date)
+            derived_variants[StatsRollup.STATS_NAME] = self.rollup.save()
+        except Exception as e:
+            logger.warning("Failed to update stats: %s", e)
+        
+        try:
+            self.trending.add(date_str, new_articles)
+            derived_variants[TrendingEngine.OUTPUT_NAME] = self.trending.save()
+        except Exception as e:
+            logger.warning("Failed to update trending terms: %s", e)
+        
+        try:
+            self.feeds.publish(new_articles, today.astimezone())
+        except Exception as e:
+            logger.warning("Failed to update feeds: %s", e)
+        
+        if derived_variants:
+            self.writer.update_manifest(derived_variants)
     
     def run(self) -> None:
         """Run the complete scraping process."""
@@ -228,6 +282,13 @@ class NewsScraper:
             # Scrape all sources
             articles = self.scrape_all()
             
+            # Probe image URLs (optional) - never let it cost the scrape
+            if self.image_prober:
+                try:
+                    self.image_prober.probe_articles(articles)
+                except Exception as e:
+                    logger.warning("Image probing failed, saving without image metadata: %s", e)
+            
             # Save to JSON
             self.save_to_json(articles)
             
@@ -242,7 +303,12 @@ class NewsScraper:
 
 def main():
     """Main entry point."""
-    scraper = NewsScraper()
+    parser = argparse.ArgumentParser(description="Scrape news from all configured sources")
+    parser.add_argument('--probe-images', action='store_true',
+                        help="Probe image URLs and attach status, size and dimensions")
+    args = parser.parse_args()
+    
+    scraper = NewsScraper(probe_images=args.probe_images)
     scraper.run()
 
 
@@ -12,6 +12,16 @@ from pydantic import BaseModel, Field
 logger = logging.getLogger(__name__)
 
 
+class ImageMeta(BaseModel):
+    """Pydantic model for the probed metadata of an article image."""
+    url: str = Field(..., description="Absolute image URL that was probed")
+    status: Optional[int] = Field(default=None, description="HTTP status code")
+    content_type: Optional[str] = Field(default=None, description="MIME type of the image")
+    bytes: Optional[int] = Field(default=None, description="Size of the image in bytes")
+    width: Optional[int] = Field(default=None, description="Width in pixels")
+    height: Optional[int] = Field(default=None, description="Height in pixels")
+
+
 class Article(BaseModel):
     """Pydantic model for a news article."""
     title: str = Field(..., min_length=1, description="Article title")
@@ -20,6 +30,7 @@ class Article(BaseModel):
     language: str = Field(..., pattern=r'^[a-z]{2}$', description="Two-letter language code (e.g., 'en', 'np')")
     source_url: str = Field(default="", description="URL to the original article")
     image_url: str = Field(default="", description="URL to the article image")
+    image: Optional[ImageMeta] = Field(default=None, description="Probed image metadata (see image_probe.py)")
     
     class Config:
         """Pydantic configuration."""
@@ -0,0 +1,287 @@
+"""
+Materialized archive statistics with incremental rollups.
+
+Keeps weekly (ISO week) and monthly article counts per source and language
+for the whole archive in data/stats.json, daily counts for the most recent
+days only, and a per-source summary (first/last seen, uptime, number of days
+with zero articles and the recent zero days as date ranges). Full per-day
+detail stays in the day files. The scraper updates the rollups from each
+save_to_json call; the archive can be rebuilt with:
+
+    python rollups.py backfill [--data-dir data] [--workers N]
+"""
+import argparse
+import json
+import logging
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from snapshot_writer import SnapshotWriter
+
+logger = logging.getLogger(__name__)
+
+DAY_FILE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}\.json$')
+
+
+def summarize_day(articles: List[dict]) -> dict:
+    """
+    Count articles of a single day per source and language.
+
+    Args:
+        articles: Article dictionaries of one day
+
+    Returns:
+        Dictionary with 'total', 'sources' and 'languages' counts
+    """
+    sources: Dict[str, dict] = {}
+    languages = Counter()
+    for article in articles:
+        source = article.get('source', '')
+        language = article.get('language', '')
+        entry = sources.setdefault(source, {'total': 0, 'languages': {}})
+        entry['total'] += 1
+        entry['languages'][language] = entry['languages'].get(language, 0) + 1
+        languages[language] += 1
+
+    return {
+        'total': len(articles),
+        'sources': dict(sorted(sources.items())),
+        'languages': dict(sorted(languages.items()))
+    }
+
+
+def _apply(target: dict, summary: dict, sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) a nested count summary from target."""
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            child = target.setdefault(key, {})
+            _apply(child, value, sign)
+            if not child:
+                del target[key]
+        else:
+            target[key] = target.get(key, 0) + sign * value
+            if target[key] == 0:
+                del target[key]
+
+
+def _date_ranges(days: List[str]) -> List[List[str]]:
+    """Collapse sorted YYYY-MM-DD dates into [first, last] ranges of consecutive days."""
+    ranges: List[List[str]] = []
+    for day in days:
+        if ranges and date.fromisoformat(day) - date.fromisoformat(ranges[-1][1]) == timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+
+def _period_keys(date_str: str) -> Tuple[str, str]:
+    """Return the (ISO week, month) rollup keys for a YYYY-MM-DD date."""
+    day = date.fromisoformat(date_str)
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}", day.strftime('%Y-%m')
+
+
+def _summarize_file(file_path: Path) -> Optional[Tuple[str, dict]]:
+    """Summarize one archived day file (runs in a worker process)."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning("Could not load %s: %s", file_path, e)
+        return None
+    return file_path.stem, summarize_day(data.get('articles', []))
+
+
+class StatsRollup:
+    """Maintains materialized archive statistics in data/stats.json."""
+
+    STATS_NAME = 'stats.json'
+
+    def __init__(self, writer: SnapshotWriter, expected_sources: Iterable[str] = (),
+                 daily_days: int = 60):
+        """
+        Initialize the rollup and load the existing stats file.
+
+        Args:
+            writer: Snapshot writer used to save stats.json and its variants
+            expected_sources: Names of the configured sources, so sources that
+                never returned an article are still reported
+            daily_days: Number of most recent days kept in the daily rollup
+        """
+        self.writer = writer
+        self.stats_file = writer.output_dir / self.STATS_NAME
+        self.expected_sources = set(expected_sources)
+        self.daily_days = daily_days
+        self.seen: Dict[str, List[str]] = {}
+        self.daily: Dict[str, dict] = {}
+        self.weekly: Dict[str, dict] = {}
+        self.monthly: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.stats_file.exists():
+            return
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Could not load stats from %s: %s", self.stats_file, e)
+            return
+        self.daily = stats.get('daily', {})
+        self.weekly = stats.get('weekly', {})
+        self.monthly = stats.get('monthly', {})
+        self.expected_sources.update(stats.get('expected_sources', []))
+        for source, summary in stats.get('sources', {}).items():
+            if summary.get('first_seen'):
+                self.seen[source] = [summary['first_seen'], summary['last_seen']]
+
+    def update_day(self, date_str: str, articles: List[dict]) -> None:
+        """
+        Replace the rollup of one day and adjust its week and month.
+
+        Only the difference between the old and new daily summary is applied
+        to the weekly and monthly aggregates, so no other day is re-read.
+        Days older than the daily rollup are ignored, since their previous
+        counts are no longer known; use backfill() to rebuild them.
+
+        Args:
+            date_str: Date of the articles (YYYY-MM-DD)
+            articles: All article dictionaries of that day
+        """
+        self._set_day(date_str, summarize_day(articles))
+
+    @staticmethod
+    def _period_delta(summary: dict) -> dict:
+        """Daily summary as added to a period: one day, and one active day per source."""
+        sources = {name: dict(counts, days=1) for name, counts in summary['sources'].items()}
+        return dict(summary, days=1, sources=sources)
+
+    def _set_day(self, date_str: str, summary: dict) -> None:
+        old = self.daily.get(date_str)
+        if old is None and len(self.daily) >= self.daily_days and date_str < min(self.daily):
+            # The day may have been trimmed already, so its old counts are unknown
+            logger.warning("Ignoring stats for %s, older than the daily rollup; run backfill instead",
+                           date_str)
+            return
+        week_key, month_key = _period_keys(date_str)
+        for periods, key in ((self.weekly, week_key), (self.monthly, month_key)):
+            period = periods.setdefault(key, {})
+            if old is not None:
+                _apply(period, self._period_delta(old), -1)
+            _apply(period, self._period_delta(summary), 1)
+        self.daily[date_str] = summary
+
+        for source in summary['sources']:
+            first, last = self.seen.get(source, [date_str, date_str])
+            self.seen[source] = [min(first, date_str), max(last, date_str)]
+
+        # Older days remain available in the weekly/monthly rollups and day files
+        for day in sorted(self.daily)[:-self.daily_days]:
+            del self.daily[day]
+
+    def source_summary(self) -> Dict[str, dict]:
+        """
+        Summarize availability of every known source over the whole archive.
+
+        Totals come from the monthly rollups; zero days are listed as date
+        ranges for the days still kept in the daily rollup.
+
+        Returns:
+            Mapping of source name to first/last seen date, active days,
+            uptime, zero day count and recent zero day ranges
+        """
+        days_tracked = sum(month.get('days', 0) for month in self.monthly.values())
+        recent_days = sorted(self.daily)
+        sources = set(self.expected_sources) | set(self.seen)
+
+        result = {}
+        for source in sorted(sources):
+            monthly = [month['sources'][source] for month in self.monthly.values()
+                       if source in month.get('sources', {})]
+            days_active = sum(counts.get('days', 0) for counts in monthly)
+            first_seen, last_seen = self.seen.get(source, [None, None])
+            result[source] = {
+                'first_seen': first_seen,
+                'last_seen': last_seen,
+                'days_active': days_active,
+                'days_tracked': days_tracked,
+                'uptime': round(days_active / days_tracked, 4) if days_tracked else 0.0,
+                'total_articles': sum(counts.get('total', 0) for counts in monthly),
+                'zero_day_count': days_tracked - days_active,
+                'recent_zero_days': _date_ranges(
+                    [d for d in recent_days if source not in self.daily[d]['sources']]
+                )
+            }
+        return result
+
+    def save(self) -> Dict[str, dict]:
+        """
+        Write data/stats.json and its variants.
+
+        Returns:
+            The variants returned by SnapshotWriter.write()
+        """
+        stats = {
+            'updated_at': datetime.now().isoformat(),
+            'expected_sources': sorted(self.expected_sources),
+            'sources': self.source_summary(),
+            'daily': dict(sorted(self.daily.items())),
+            'weekly': dict(sorted(self.weekly.items())),
+            'monthly': dict(sorted(self.monthly.items()))
+        }
+        variants = self.writer.write(self.stats_file, stats)
+        logger.info("Saved stats for %d days to %s", len(self.daily), self.stats_file)
+        return variants
+
+    def backfill(self, workers: Optional[int] = None) -> None:
+        """
+        Rebuild all rollups from the day files in the archive.
+
+        Day files are parsed in parallel worker processes.
+
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+        """
+        files = sorted(p for p in self.writer.output_dir.iterdir()
+                       if DAY_FILE_PATTERN.match(p.name))
+        logger.info("Backfilling stats from %d day files...", len(files))
+
+        self.daily, self.weekly, self.monthly, self.seen = {}, {}, {}, {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_summarize_file, files, chunksize=8):
+                if result is not None:
+                    self._set_day(*result)
+
+
+def main():
+    """Command line entry point for backfilling the stats file."""
+    parser = argparse.ArgumentParser(description="Materialized archive statistics")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    backfill_parser = subparsers.add_parser('backfill', help="Rebuild stats from the archive")
+    backfill_parser.add_argument('--data-dir', default='data', help="Directory with the day files")
+    backfill_parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    from sources import ALL_SOURCES
+    expected = [source_class().source_name for source_class in ALL_SOURCES]
+
+    writer = SnapshotWriter(Path(args.data_dir))
+    rollup = StatsRollup(writer, expected)
+    rollup.backfill(args.workers)
+    writer.update_manifest({StatsRollup.STATS_NAME: rollup.save()})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-source and per-language sharded views of a daily snapshot.
+
+For data/YYYY-MM-DD.json the following files are written:
+- data/YYYY-MM-DD/source/<source>.json  - Articles from a single source
+- data/YYYY-MM-DD/lang/<code>.json      - Articles in a single language
+- data/YYYY-MM-DD/index.json            - Available shards with counts and hashes
+
+Source names and language codes are passed through slugify, and each kind of
+shard has its own directory, so no name can overwrite another shard or the
+index.
+
+Shards carry no timestamp, so a shard whose articles did not change keeps
+identical bytes and is not rewritten.
+"""
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+from snapshot_writer import SnapshotWriter, slugify, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+
+def _group_by(articles: List[dict], field: str) -> Dict[str, List[dict]]:
+    groups = defaultdict(list)
+    for article in articles:
+        groups[article.get(field, '')].append(article)
+    return dict(sorted(groups.items()))
+
+
+def write_shards(writer: SnapshotWriter, date_str: str, articles: List[dict]) -> dict:
+    """
+    Write per-source and per-language shards for one day.
+
+    Args:
+        writer: Snapshot writer used for the shard files and their variants
+        date_str: Date of the snapshot (YYYY-MM-DD)
+        articles: All article dictionaries of that day
+
+    Returns:
+        The shard index that was written to data/YYYY-MM-DD/index.json
+    """
+    shard_dir = writer.output_dir / date_str
+    index = {
+        'date': date_str,
+        'total_articles': len(articles),
+        'sources': {},
+        'languages': {}
+    }
+
+    shard_groups = [
+        ('sources', 'source', 'source'),
+        ('languages', 'language', 'lang')
+    ]
+    for index_key, field, sub_dir in shard_groups:
+        for value, group in _group_by(articles, field).items():
+            if not value:
+                continue
+            shard_file = shard_dir / sub_dir / f"{slugify(value)}.json"
+            variants = writer.write(shard_file, {
+                'date': date_str,
+                field: value,
+                'total_articles': len(group),
+                'articles': group
+            })
+            index[index_key][value] = {
+                'path': variants['.json']['path'],
+                'count': len(group),
+                'sha256': variants['.json']['sha256'],
+                'variants': {suffix: v['path'] for suffix, v in variants.items()}
+            }
+
+    index_file = shard_dir / 'index.json'
+    payload = json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8')
+    if write_if_changed(index_file, payload):
+        logger.info("Updated shards in %s (%d sources, %d languages)",
+                    shard_dir, len(index['sources']), len(index['languages']))
+
+    return index
@@ -0,0 +1,194 @@
+"""
+Snapshot writer that stores JSON output in several representations.
+
+For every snapshot (e.g. data/YYYY-MM-DD.json) the writer produces:
+- name.json      - Pretty printed JSON (indent=2), as before
+- name.min.json  - Minified JSON without whitespace
+- name.json.gz   - Gzip compressed minified JSON
+- name.json.zst  - Zstandard compressed minified JSON (if zstandard is installed)
+- name.json.br   - Brotli compressed minified JSON (if brotli is installed)
+
+The pretty and minified files come from two separate json.dumps calls; the
+compressed variants are all built from the minified bytes without encoding
+again. A manifest (data/manifest.json) lists every variant with its size and
+SHA-256 hash.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _gzip(payload: bytes) -> bytes:
+    # mtime=0 keeps the output byte-for-byte reproducible
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def _available_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Return the compressors available in this environment, keyed by suffix."""
+    compressors: Dict[str, Callable[[bytes], bytes]] = {'.json.gz': _gzip}
+    if zstandard is not None:
+        compressors['.json.zst'] = zstandard.ZstdCompressor(level=19).compress
+    if brotli is not None:
+        compressors['.json.br'] = lambda payload: brotli.compress(payload, quality=11)
+    return compressors
+
+
+def sha256_hex(payload: bytes) -> str:
+    """Return the hex encoded SHA-256 digest of payload."""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def slugify(name: str) -> str:
+    """
+    Turn a display name (e.g. a source name) into a safe file name and URL segment.
+
+    Names that are already safe (ASCII letters, digits, '.', '_' and '-') are
+    returned unchanged. Otherwise runs of other characters become a single '-'
+    and a short hash of the name is appended, so "Your Source Name" becomes
+    "Your-Source-Name-<hash>", a '/' can never leave the target directory and
+    two names that differ only in unsafe characters get different slugs.
+    Slugging a slug returns it unchanged.
+
+    Args:
+        name: Display name
+
+    Returns:
+        Slug for use in paths and URLs
+    """
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '-', name).strip('-.')
+    if slug == name:
+        return slug
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}" if slug else f"x-{digest}"
+
+
+def write_if_changed(file_path: Path, payload: bytes) -> bool:
+    """
+    Write payload to file_path unless the file already has identical content.
+
+    Args:
+        file_path: Destination file
+        payload: Bytes to write
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    try:
+        if file_path.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(payload)
+    return True
+
+
+class SnapshotWriter:
+    """Writes JSON snapshots with minified and precompressed variants."""
+
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, output_dir: Path, compressors: Optional[Dict[str, Callable[[bytes], bytes]]] = None):
+        """
+        Initialize the snapshot writer.
+
+        Args:
+            output_dir: Directory that holds the snapshots and the manifest
+            compressors: Mapping of file suffix to compression function.
+                Defaults to gzip plus zstd/brotli when installed.
+        """
+        self.output_dir = Path(output_dir)
+        self.compressors = compressors if compressors is not None else _available_compressors()
+        self.manifest_file = self.output_dir / self.MANIFEST_NAME
+
+    @staticmethod
+    def encode(data: dict) -> tuple[bytes, bytes]:
+        """
+        Encode data as pretty and minified UTF-8 JSON.
+
+        Returns:
+            Tuple of (pretty bytes, minified bytes)
+        """
+        pretty = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        minified = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return pretty, minified
+
+    def write(self, file_path: Path, data: dict) -> Dict[str, dict]:
+        """
+        Write data to file_path and all of its variants.
+
+        Args:
+            file_path: Path of the pretty JSON file (must end in .json)
+            data: JSON serializable data
+
+        Returns:
+            Mapping of variant suffix to {'path', 'bytes', 'sha256'}
+        """
+        file_path = Path(file_path)
+        stem = file_path.name[:-len('.json')]
+        pretty, minified = self.encode(data)
+
+        payloads = {'.json': pretty, '.min.json': minified}
+        for suffix, compress in self.compressors.items():
+            payloads[suffix] = compress(minified)
+
+        variants = {}
+        for suffix, payload in payloads.items():
+            variant_path = file_path.with_name(stem + suffix)
+            write_if_changed(variant_path, payload)
+            variants[suffix] = {
+                'path': variant_path.relative_to(self.output_dir).as_posix(),
+                'bytes': len(payload),
+                'sha256': sha256_hex(payload)
+            }
+
+        return variants
+
+    def update_manifest(self, entries: Dict[str, Dict[str, dict]]) -> None:
+        """
+        Merge snapshot entries into the manifest and save it.
+
+        Args:
+            entries: Mapping of snapshot path (relative to output_dir) to the
+                variants returned by write()
+        """
+        manifest = {'files': {}}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning("Could not load manifest from %s: %s", self.manifest_file, e)
+
+        files = manifest.setdefault('files', {})
+        for name, variants in entries.items():
+            files[name] = {
+                'variants': variants,
+                'smallest': min(variants.values(), key=lambda v: v['bytes'])['path']
+            }
+
+        manifest['generated_at'] = datetime.now().isoformat()
+        manifest['files'] = dict(sorted(files.items()))
+
+        with open(self.manifest_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        logger.info("Updated manifest %s (%d files)", self.manifest_file, len(files))
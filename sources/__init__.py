@@ -7,7 +7,16 @@ from .kathmandu_post import KathmanduPostSource
 from .ekantipur import EkantipurSource
 from .nagarik_news import NagarikNewsSource
 
+# Sources scraped by main.py and expected in the stats rollup
+ALL_SOURCES = [
+    News24Source,
+    KathmanduPostSource,
+    EkantipurSource,
+    NagarikNewsSource
+]
+
 __all__ = [
+    'ALL_SOURCES',
     'News24Source',
     'KathmanduPostSource',
     'EkantipurSource',
@@ -7,15 +7,12 @@ To add a new news source:
 3. Update source_name and language properties
 4. Implement the scrape() method with your scraping logic
 5. Add the import to sources/__init__.py
-6. Add an instance to scrape_news.py
+6. Add the class to ALL_SOURCES in sources/__init__.py
 
 Example:
-    from sources import YourSourceSource
-    
-    # In NewsScraper.__init__:
-    self.sources = [
+    ALL_SOURCES = [
         ...,
-        YourSourceSource()
+        YourSourceSource
     ]
 """
 import logging
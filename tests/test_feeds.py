@@ -0,0 +1,62 @@
+"""
+Tests for the feed ring in feeds.py.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from feeds import FeedPublisher
+from snapshot_writer import SnapshotWriter
+
+START = datetime(2025, 1, 1, 6, 0, tzinfo=timezone(timedelta(hours=5, minutes=45)))
+
+
+def _articles(source, numbers):
+    return [{'title': f"{source} story {n}", 'summary': f"Summary {n}", 'source': source,
+             'source_url': f"https://example.com/{source}/{n}", 'image_url': '', 'language': 'en'}
+            for n in numbers]
+
+
+def _items(feeds_dir, path):
+    with open(feeds_dir / path / 'feed.json', encoding='utf-8') as f:
+        return json.load(f)['items']
+
+
+@pytest.fixture
+def publisher(tmp_path):
+    return FeedPublisher(SnapshotWriter(tmp_path), max_items=5)
+
+
+def test_ring_is_capped_newest_first_without_duplicates(publisher):
+    publisher.publish(_articles('News24', range(3)), START)
+    # Two already published articles come back together with four new ones
+    publisher.publish(_articles('News24', range(1, 7)), START + timedelta(hours=1))
+
+    items = _items(publisher.feeds_dir, 'source/News24')
+    assert len(items) == 5
+    assert len({item['id'] for item in items}) == 5
+    assert [item['title'] for item in items] == [f"News24 story {n}" for n in range(3, 7)] + ['News24 story 0']
+
+
+def test_feeds_are_untouched_when_nothing_is_new(publisher):
+    publisher.publish(_articles('News24', range(3)) + _articles('Ekantipur', range(2)), START)
+    files = sorted(p for p in publisher.feeds_dir.rglob('*') if p.is_file())
+    before = {path: (path.stat().st_mtime_ns, path.read_bytes()) for path in files}
+
+    publisher.publish(_articles('News24', range(3)), START + timedelta(hours=1))
+    publisher.publish([], START + timedelta(hours=2))
+
+    assert sorted(p for p in publisher.feeds_dir.rglob('*') if p.is_file()) == files
+    assert {path: (path.stat().st_mtime_ns, path.read_bytes()) for path in files} == before
+
+
+def test_source_named_all_gets_its_own_feed(publisher):
+    publisher.publish(_articles('all', range(2)) + _articles('News24', range(1)), START)
+
+    assert len(_items(publisher.feeds_dir, 'all')) == 3
+    assert len(_items(publisher.feeds_dir, 'source/all')) == 2
+    with open(publisher.feeds_dir / 'index.json', encoding='utf-8') as f:
+        index = json.load(f)['feeds']
+    assert list(index) == ['all', 'source/News24', 'source/all']
+    assert index['source/all']['files']['rss.xml']['url'].endswith('/feeds/source/all/rss.xml')
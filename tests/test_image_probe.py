@@ -0,0 +1,185 @@
+"""
+Tests for image_probe.py against a local stand-in image server.
+"""
+import struct
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from image_probe import ImageProber, image_dimensions, resolve_image_url
+from news_source import Article
+
+
+def _png(width, height):
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IDAT', zlib.compress(b'\x00')) + chunk(b'IEND', b'')
+
+
+def _gif(width, height):
+    return b'GIF89a' + struct.pack('<HH', width, height) + b'\x00' * 20
+
+
+def _jpeg(width, height):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    exif = b'\xff\xe1' + struct.pack('>H', 2002) + b'\x00' * 2000
+    sof = b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+    return b'\xff\xd8' + app0 + exif + sof + b'\xff\xd9'
+
+
+def _webp(width, height):
+    return (b'RIFF' + struct.pack('<I', 30) + b'WEBPVP8X' + struct.pack('<I', 10) + b'\x00' * 4
+            + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little'))
+
+
+FILES = {
+    '/img/a.png': ('image/png', _png(640, 360)),
+    '/img/b.gif': ('image/gif', _gif(120, 80)),
+    '/img/c.jpg': ('image/jpeg', _jpeg(1920, 1080)),
+    '/img/d.webp': ('image/webp', _webp(800, 600)),
+    '/page.html': ('text/html', b'<html>' + b' ' * 100000 + b'</html>'),
+    '/empty.png': ('image/png', b''),
+}
+
+
+class StandInImageHandler(BaseHTTPRequestHandler):
+    """Serves FILES with Range support; /norange/ ignores Range, /flaky.png fails."""
+
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, send_body):
+        self.requests_seen.append((self.command, self.path))
+        if self.path == '/flaky.png':
+            self.send_response(503)
+            self.end_headers()
+            return
+        ignore_range = self.path.startswith('/norange/')
+        path = self.path[len('/norange'):] if ignore_range else self.path
+        if path not in FILES:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        content_type, body = FILES[path]
+        range_header = self.headers.get('Range')
+        if range_header and not ignore_range:
+            start, end = (int(v) for v in range_header[len('bytes='):].split('-'))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{len(body)}")
+                self.end_headers()
+                return
+            part = body[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{start + len(part) - 1}/{len(body)}")
+        else:
+            part = body
+            self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(part)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(part)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInImageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    StandInImageHandler.requests_seen = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def prober(tmp_path):
+    return ImageProber(tmp_path / 'image-cache.json', max_workers=4, header_bytes=4096,
+                       session=requests.Session())
+
+
+@pytest.mark.parametrize('path, width, height, content_type', [
+    ('/img/a.png', 640, 360, 'image/png'),
+    ('/img/b.gif', 120, 80, 'image/gif'),
+    ('/img/c.jpg', 1920, 1080, 'image/jpeg'),
+    ('/img/d.webp', 800, 600, 'image/webp'),
+])
+def test_probe_reads_dimensions_with_one_range_get(server, prober, path, width, height, content_type):
+    meta = prober.probe(server + path)
+
+    assert meta['status'] == 206
+    assert meta['content_type'] == content_type
+    assert meta['bytes'] == len(FILES[path][1])
+    assert (meta['width'], meta['height']) == (width, height)
+    assert StandInImageHandler.requests_seen == [('GET', path)]
+
+
+def test_probe_server_ignoring_range(server, prober):
+    meta = prober.probe(server + '/norange/img/c.jpg')
+
+    assert meta['status'] == 200
+    assert meta['bytes'] == len(FILES['/img/c.jpg'][1])
+    assert (meta['width'], meta['height']) == (1920, 1080)
+
+
+def test_probe_non_image_and_errors(server, prober):
+    page = prober.probe(server + '/page.html')
+    assert page['content_type'] == 'text/html'
+    assert 'width' not in page
+
+    assert prober.probe(server + '/missing.png')['status'] == 404
+
+    empty = prober.probe(server + '/empty.png')
+    assert empty['status'] == 200
+    assert empty['bytes'] == 0
+    assert StandInImageHandler.requests_seen[-2:] == [('GET', '/empty.png'), ('HEAD', '/empty.png')]
+
+
+def test_probe_malformed_url_does_not_raise(prober):
+    meta = prober.probe('http://' + 'a' * 70 + '.com/x.png')
+    assert 'error' in meta
+
+
+def test_probe_articles_caches_final_results_only(server, prober, tmp_path):
+    articles = [
+        Article(title=f"t{i}", summary='s', source='Test', language='en',
+                source_url=server + '/news/story', image_url=image_url)
+        for i, image_url in enumerate(['/img/a.png', '../img/b.gif', '/missing.png', '/flaky.png', ''])
+    ]
+
+    prober.probe_articles(articles)
+
+    assert (articles[0].image.width, articles[0].image.height) == (640, 360)
+    assert articles[1].image.url == server + '/img/b.gif'
+    assert articles[2].image.status == 404
+    assert articles[3].image.status == 503
+    assert articles[4].image is None
+    assert set(prober.cache) == {server + '/img/a.png', server + '/img/b.gif', server + '/missing.png'}
+
+    # A new prober loads the cache and only retries the transient failure
+    StandInImageHandler.requests_seen = []
+    again = ImageProber(tmp_path / 'image-cache.json', session=requests.Session())
+    again.probe_articles(articles)
+    assert StandInImageHandler.requests_seen == [('GET', '/flaky.png')]
+
+
+def test_image_dimensions_and_url_resolution():
+    assert image_dimensions(b'not an image') is None
+    assert image_dimensions(_png(1, 2)) == (1, 2)
+    assert resolve_image_url('/a.png', 'https://example.com/news/1') == 'https://example.com/a.png'
+    assert resolve_image_url('data:image/png;base64,xx', 'https://example.com/') == ''
+    assert resolve_image_url('', 'https://example.com/') == ''
@@ -0,0 +1,65 @@
+"""
+Tests for rollups.py: incremental updates must match a backfill of the archive.
+"""
+import json
+from datetime import date, timedelta
+
+from rollups import StatsRollup
+from snapshot_writer import SnapshotWriter
+
+SOURCES = ['News24', 'KathmanduPost', 'Ekantipur']
+
+
+def _day_articles(day: date, runs: int):
+    """Articles of one day as seen after the given number of scraper runs."""
+    articles = []
+    for run in range(runs):
+        for i, source in enumerate(SOURCES):
+            # Ekantipur is down every fifth day
+            if source == 'Ekantipur' and day.day % 5 == 0:
+                continue
+            for n in range(i + 1):
+                articles.append({'title': f"{day} {source} {run} {n}", 'source': source,
+                                 'language': 'ne' if n % 2 else 'en'})
+    return articles
+
+
+def _comparable(rollup: StatsRollup) -> dict:
+    return {
+        'sources': rollup.source_summary(),
+        'daily': rollup.daily,
+        'weekly': rollup.weekly,
+        'monthly': rollup.monthly
+    }
+
+
+def test_incremental_updates_match_backfill(tmp_path):
+    writer = SnapshotWriter(tmp_path / 'data')
+    writer.output_dir.mkdir()
+    incremental = StatsRollup(writer, SOURCES, daily_days=10)
+
+    start = date(2025, 12, 20)
+    days = [start + timedelta(days=offset) for offset in range(30)]
+    for day in days:
+        # Several runs a day, each replacing the day's summary
+        for runs in (1, 2, 3):
+            incremental.update_day(day.isoformat(), _day_articles(day, runs))
+        with open(writer.output_dir / f"{day}.json", 'w', encoding='utf-8') as f:
+            json.dump({'articles': _day_articles(day, 3)}, f)
+
+    # A late update of a day that was already trimmed from the daily rollup
+    incremental.update_day(days[0].isoformat(), _day_articles(days[0], 3))
+    incremental.save()
+
+    backfilled = StatsRollup(writer, SOURCES, daily_days=10)
+    backfilled.backfill(workers=2)
+    assert _comparable(backfilled) == _comparable(incremental)
+
+    # The saved stats file loads back into the same rollups
+    assert _comparable(StatsRollup(writer, SOURCES, daily_days=10)) == _comparable(incremental)
+
+    summary = backfilled.source_summary()
+    assert len(backfilled.daily) == 10
+    assert backfilled.monthly['2025-12']['days'] == 12
+    assert summary['News24']['days_active'] == 30
+    assert summary['Ekantipur']['zero_day_count'] == 6
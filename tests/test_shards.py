@@ -0,0 +1,69 @@
+"""
+Tests for shards.py and the write_if_changed/slugify helpers it relies on.
+"""
+import json
+
+import pytest
+
+from shards import write_shards
+from snapshot_writer import SnapshotWriter, slugify, write_if_changed
+
+
+def _article(title, source, language='en'):
+    return {'title': title, 'summary': '', 'source': source, 'source_url': '',
+            'image_url': '', 'language': language}
+
+
+@pytest.fixture
+def writer(tmp_path):
+    return SnapshotWriter(tmp_path)
+
+
+def test_write_if_changed_skips_identical_payload(tmp_path):
+    file_path = tmp_path / 'a' / 'b.json'
+    assert write_if_changed(file_path, b'{}')
+    assert not write_if_changed(file_path, b'{}')
+    assert write_if_changed(file_path, b'[]')
+    assert file_path.read_bytes() == b'[]'
+
+
+def test_slugify_keeps_safe_names_and_separates_unsafe_ones():
+    assert slugify('KathmanduPost') == 'KathmanduPost'
+    assert slugify('Your Source') != slugify('Your/Source')
+    assert slugify('Your Source').startswith('Your-Source-')
+    assert slugify(slugify('Your Source')) == slugify('Your Source')
+    assert slugify('..').startswith('x-')
+    assert '/' not in slugify('../../etc')
+
+
+def test_unchanged_shard_is_not_rewritten(writer, tmp_path):
+    articles = [_article('One', 'News24'), _article('Two', 'KathmanduPost', 'ne')]
+    write_shards(writer, '2025-01-01', articles)
+    shard = tmp_path / '2025-01-01' / 'source' / 'News24.json'
+    other = tmp_path / '2025-01-01' / 'source' / 'KathmanduPost.json'
+    before = {path: path.stat().st_mtime_ns for path in (shard, other)}
+
+    # Only the KathmanduPost shard gets a new article
+    articles.append(_article('Three', 'KathmanduPost', 'ne'))
+    index = write_shards(writer, '2025-01-01', articles)
+
+    assert shard.stat().st_mtime_ns == before[shard]
+    assert other.stat().st_mtime_ns != before[other]
+    assert index['sources']['KathmanduPost']['count'] == 2
+    assert index['languages']['ne']['path'] == '2025-01-01/lang/ne.json'
+
+
+def test_source_names_cannot_overwrite_other_shards(writer, tmp_path):
+    articles = [
+        _article('One', 'index'),
+        _article('Two', 'lang-en'),
+        _article('Three', 'A B'),
+        _article('Four', 'A/B')
+    ]
+    index = write_shards(writer, '2025-01-01', articles)
+
+    paths = [entry['path'] for entry in index['sources'].values()]
+    paths += [entry['path'] for entry in index['languages'].values()]
+    assert len(set(paths)) == 5
+    with open(tmp_path / '2025-01-01' / 'index.json', encoding='utf-8') as f:
+        assert json.load(f)['total_articles'] == 4
@@ -0,0 +1,39 @@
+"""
+Tests for the tokenizer and daily buckets in trending.py.
+"""
+from snapshot_writer import SnapshotWriter
+from trending import TrendingEngine, tokenize
+
+
+def test_tokenize_strips_nepali_suffixes():
+    assert tokenize('नेपालको सरकार') == ['नेपाल', 'सरकार']
+    assert tokenize('विद्यार्थीहरूलाई काठमाडौंमा') == ['विद्यार्थी', 'काठमाडौं']
+    # Short stems are kept whole
+    assert tokenize('सीमा बाँकी') == ['सीमा', 'बाँकी']
+
+
+def test_tokenize_drops_stopwords_before_and_after_stripping():
+    assert tokenize('उनले भएको रहेको उनको निर्वाचन') == ['निर्वाचन']
+    assert tokenize('The election of 2025 was held in Nepal') == ['election', 'held', 'nepal']
+
+
+def test_tokenize_normalizes_text():
+    # Nukta letters in either form, zero width joiner and upper case
+    assert tokenize('\u0921\u093c\u0930\u200d ELECTION') == tokenize('\u095c\u0930 election')
+    assert tokenize('\u095c\u0930 election') == ['\u0921\u093c\u0930', 'election']
+
+
+def test_engine_counts_new_day_in_new_bucket(tmp_path):
+    writer = SnapshotWriter(tmp_path)
+    engine = TrendingEngine(writer, window_days=1, baseline_days=2, min_count=1)
+    engine.add('2025-01-01', [{'title': 'Budget session', 'summary': ''}])
+    engine.add('2025-01-03', [{'title': 'Flood warning', 'summary': 'Flood warning issued'}])
+    engine.save()
+
+    reloaded = TrendingEngine(writer, window_days=1, baseline_days=2, min_count=1)
+    assert [bucket['date'] for bucket in reloaded.buckets] == ['2025-01-01', '2025-01-02', '2025-01-03']
+    trending = reloaded.trending()
+    assert trending['window'] == ['2025-01-03']
+    assert {term['term']: term['count'] for term in trending['terms']} == {
+        'flood': 1, 'warning': 1, 'issued': 1
+    }
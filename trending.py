@@ -0,0 +1,275 @@
+"""
+Sliding-window trending terms over scraped article titles and summaries.
+
+Articles are fed incrementally (only the new ones of each run) into daily
+buckets of term and bigram document counts. Buckets live in a bounded deque,
+so adding a new day expires the oldest one in O(1). A bucket is trimmed to
+its max_terms most frequent entries when it is closed (when the next day's
+bucket opens), so the counts of the current day are always exact. The state
+is persisted in data/trending-state.json and the top terms of the current
+window are written to data/trending.json.
+
+A term trends when its count in the current window is high compared to its
+average count in the preceding baseline window.
+"""
+import json
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from snapshot_writer import SnapshotWriter
+
+logger = logging.getLogger(__name__)
+
+# Devanagari letters and vowel signs (without danda and digits) plus ZWJ/ZWNJ,
+# or lowercase latin words
+TOKEN_PATTERN = re.compile(r'[\u0900-\u0963\u0971-\u097F\u200c\u200d]+|[a-z0-9]+')
+
+# Case markers and plural suffixes that are written attached to Nepali nouns,
+# longest first so e.g. "हरूको" is removed instead of just "को"
+NEPALI_SUFFIXES = (
+    'हरूलाई', 'हरूको', 'हरूका', 'हरूले', 'हरूमा', 'हरूबाट',
+    'भन्दा', 'देखि', 'सम्म', 'तर्फ', 'लाई', 'बाट', 'सँग', 'हरू',
+    'को', 'का', 'की', 'ले', 'मा'
+)
+
+STOPWORDS = frozenset("""
+a about after against all also an and any are as at be been before being but
+by can could did do does during for from had has have he her his how i if in
+into is it its itself may more most new no not of on one or our out over said
+says she so some such than that the their them then there these they this those
+through to under up was we were what when where which while who will with would
+you your year years
+र तथा पनि भने छ छन् हो हुन् थियो थिए भएको भएका भएर गर्न गरेको गरेका गर्ने गरी
+गरे गर्दै यो त्यो यस उक्त यी ती एक अब के कि नै तर वा लागि अनुसार रहेको रहेका हुने
+भन्ने भनेर जना आज सबै आफ्नो उनी उनले उनको हामी म मैले अझै फेरि बीच साथै
+""".split())
+
+
+def _base_letters(token: str) -> int:
+    """Count Devanagari letters, ignoring vowel signs, virama, nukta and nasal marks."""
+    return sum(1 for ch in token
+               if '\u0904' <= ch <= '\u0939' or '\u0958' <= ch <= '\u0961' or '\u0972' <= ch <= '\u097f')
+
+
+def _strip_suffix(token: str) -> str:
+    # The stem must keep two letters, so words such as "सीमा" or "बाँकी"
+    # are not cut down to a single syllable
+    for suffix in NEPALI_SUFFIXES:
+        if token.endswith(suffix) and _base_letters(token[:-len(suffix)]) >= 2:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split English or Nepali text into normalized content words.
+
+    Text is NFC normalized and lowercased, Nepali case markers are stripped
+    from Devanagari words, and stopwords, numbers and very short words are
+    dropped. Stopwords are checked before and after stripping, so inflected
+    stopwords such as "उनले" are not reduced to a new term.
+
+    Args:
+        text: Title or summary text
+
+    Returns:
+        List of tokens in their original order
+    """
+    text = unicodedata.normalize('NFC', text).lower()
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token.isascii():
+            if len(token) < 3 or token.isdigit():
+                continue
+        else:
+            token = token.strip('\u200c\u200d')
+            if token in STOPWORDS:
+                continue
+            token = _strip_suffix(token)
+            if len(token) < 2:
+                continue
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def _article_terms(article: dict) -> tuple[Set[str], Set[str]]:
+    """Return the distinct terms and bigrams of an article."""
+    terms, bigrams = set(), set()
+    texts = {article.get('title', ''), article.get('summary', '')}
+    for text in texts:
+        tokens = tokenize(text)
+        terms.update(tokens)
+        bigrams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms, bigrams
+
+
+class TrendingEngine:
+    """Incremental trending terms over daily buckets."""
+
+    STATE_NAME = 'trending-state.json'
+    OUTPUT_NAME = 'trending.json'
+
+    def __init__(self, writer: SnapshotWriter, window_days: int = 1, baseline_days: int = 7,
+                 max_terms: int = 5000, top_n: int = 25, min_count: int = 2):
+        """
+        Initialize the engine and load the persisted buckets.
+
+        Args:
+            writer: Snapshot writer used to save trending.json and its variants
+            window_days: Number of most recent daily buckets that form the window
+            baseline_days: Number of daily buckets before the window used as baseline
+            max_terms: Maximum number of terms and bigrams kept per closed bucket
+            top_n: Number of terms and bigrams written to trending.json
+            min_count: Minimum window count for a term to be reported
+        """
+        self.writer = writer
+        self.state_file = writer.output_dir / self.STATE_NAME
+        self.output_file = writer.output_dir / self.OUTPUT_NAME
+        self.window_days = window_days
+        self.baseline_days = baseline_days
+        self.max_terms = max_terms
+        self.top_n = top_n
+        self.min_count = min_count
+        self.buckets: deque = deque(maxlen=window_days + baseline_days)
+        self._load()
+
+    def _load(self) -> None:
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Could not load trending state from %s: %s", self.state_file, e)
+            return
+        for bucket in state.get('buckets', []):
+            self.buckets.append({
+                'date': bucket['date'],
+                'articles': bucket.get('articles', 0),
+                'terms': Counter(bucket.get('terms', {})),
+                'bigrams': Counter(bucket.get('bigrams', {}))
+            })
+
+    def _bucket(self, date_str: str) -> Optional[dict]:
+        """Return the bucket for date_str, opening new (and gap) buckets as needed."""
+        if self.buckets and self.buckets[-1]['date'] == date_str:
+            return self.buckets[-1]
+
+        day = date.fromisoformat(date_str)
+        if self.buckets:
+            last = date.fromisoformat(self.buckets[-1]['date'])
+            if day < last:
+                logger.warning("Ignoring trending input for %s, already at %s", date_str, last)
+                return None
+            self._close(self.buckets[-1])
+            # Empty buckets for days without runs, at most one full window
+            gap = min((day - last).days - 1, self.buckets.maxlen)
+            for offset in range(gap, 0, -1):
+                self.buckets.append(self._empty_bucket(day - timedelta(days=offset)))
+
+        self.buckets.append(self._empty_bucket(day))
+        return self.buckets[-1]
+
+    @staticmethod
+    def _empty_bucket(day: date) -> dict:
+        return {'date': day.isoformat(), 'articles': 0, 'terms': Counter(), 'bigrams': Counter()}
+
+    def _close(self, bucket: dict) -> None:
+        """Trim a finished bucket to its max_terms most frequent terms and bigrams."""
+        for key in ('terms', 'bigrams'):
+            if len(bucket[key]) > self.max_terms:
+                bucket[key] = Counter(dict(bucket[key].most_common(self.max_terms)))
+
+    def add(self, date_str: str, articles: Iterable[dict]) -> None:
+        """
+        Count the terms of newly scraped articles into the bucket of date_str.
+
+        Args:
+            date_str: Date of the articles (YYYY-MM-DD)
+            articles: New article dictionaries (already de-duplicated)
+        """
+        bucket = self._bucket(date_str)
+        if bucket is None:
+            return
+        for article in articles:
+            terms, bigrams = _article_terms(article)
+            bucket['terms'].update(terms)
+            bucket['bigrams'].update(bigrams)
+            bucket['articles'] += 1
+
+    def _top(self, key: str) -> List[dict]:
+        buckets = list(self.buckets)
+        window = buckets[-self.window_days:]
+        baseline = buckets[:-self.window_days]
+
+        current = Counter()
+        for bucket in window:
+            current.update(bucket[key])
+        previous = Counter()
+        for bucket in baseline:
+            previous.update(bucket[key])
+
+        # Expected window count from the baseline's daily average
+        scale = self.window_days / len(baseline) if baseline else 0.0
+        results = []
+        for term, count in current.items():
+            if count < self.min_count:
+                continue
+            expected = previous[term] * scale
+            results.append({
+                'term': term,
+                'count': count,
+                'baseline': round(expected, 2),
+                'score': round((count - expected) / math.sqrt(expected + 1), 3)
+            })
+
+        results.sort(key=lambda r: (-r['score'], -r['count'], r['term']))
+        return results[:self.top_n]
+
+    def trending(self) -> dict:
+        """
+        Compute the top trending terms and bigrams of the current window.
+
+        Returns:
+            Dictionary in the format written to trending.json
+        """
+        window = list(self.buckets)[-self.window_days:]
+        return {
+            'updated_at': datetime.now().isoformat(),
+            'window': [bucket['date'] for bucket in window],
+            'baseline_days': len(self.buckets) - len(window),
+            'articles_in_window': sum(bucket['articles'] for bucket in window),
+            'terms': self._top('terms'),
+            'bigrams': self._top('bigrams')
+        }
+
+    def save(self) -> Dict[str, dict]:
+        """
+        Persist the buckets and write data/trending.json with its variants.
+
+        Returns:
+            The variants returned by SnapshotWriter.write()
+        """
+        state = {
+            'buckets': [
+                {
+                    'date': bucket['date'],
+                    'articles': bucket['articles'],
+                    'terms': dict(bucket['terms'].most_common()),
+                    'bigrams': dict(bucket['bigrams'].most_common())
+                }
+                for bucket in self.buckets
+            ]
+        }
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+
+        variants = self.writer.write(self.output_file, self.trending())
+        logger.info("Saved trending terms to %s", self.output_file)
+        return variants